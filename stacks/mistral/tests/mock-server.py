@@ -3,203 +3,562 @@
 Mock Mistral server for testing integration tests
 """
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
 import json
 import sys
 import logging
+import os
+import select
+import signal
+import socket
+import threading
 import time
 
-# Configure logging
+# Use orjson for per-request encoding/decoding when it is installed; its
+# JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+def _log_level(value):
+    """Resolve a level name or number, or None if it isn't one"""
+    if value.isascii() and value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else None
+
+# Configure logging; quiet by default, set MOCK_LOG_LEVEL=INFO to see requests
+_requested_level = os.environ.get('MOCK_LOG_LEVEL') or 'WARNING'
+_level = _log_level(_requested_level)
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.WARNING if _level is None else _level,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+if _level is None:
+    logger.warning("Unknown MOCK_LOG_LEVEL %r, using WARNING", _requested_level)
 
 # Maximum request size (10MB)
 MAX_REQUEST_SIZE = 10 * 1024 * 1024
 
-class MockMistralHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        if self.path == '/health':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'OK')
-        elif self.path == '/v1/models':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "models": [
-                    {
-                        "id": "qwen2.5-coder:32b",
-                        "object": "model",
-                        "created": 1700000000,
-                        "owned_by": "mistral"
-                    }
-                ]
+# Default number of worker threads handling requests
+DEFAULT_MAX_WORKERS = 32
+
+# Chunk size used when discarding request bodies nobody reads
+DRAIN_CHUNK_SIZE = 64 * 1024
+
+# Seconds an idle keep-alive connection may hold a worker thread
+KEEPALIVE_TIMEOUT = 5
+
+# How often an idle keep-alive connection checks for queued connections
+IDLE_POLL_INTERVAL = 0.05
+
+# Timestamp reported by /api/generate; tests don't need the real time, and a
+# constant avoids formatting one per request
+CREATED_AT = '2024-01-01T00:00:00.000Z'
+
+# Fixed response bodies, encoded once at import rather than per request
+HEALTH_BODY = b'OK'
+
+# Canned /health exchange for the fast path in handle_one_request
+HEALTH_REQUEST_PREFIX = b'GET /health '
+# Header line limit for the fast path, matching http.client's cap
+MAX_HEADERS = 100
+HEALTH_RESPONSE_HEAD = (b'HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n'
+                        b'Content-Length: %d\r\n' % len(HEALTH_BODY))
+HEALTH_RESPONSE = HEALTH_RESPONSE_HEAD + b'Connection: keep-alive\r\n\r\n' + HEALTH_BODY
+HEALTH_CLOSE_RESPONSE = HEALTH_RESPONSE_HEAD + b'Connection: close\r\n\r\n' + HEALTH_BODY
+
+MODELS_BODY = json.dumps({
+    "models": [
+        {
+            "id": "qwen2.5-coder:32b",
+            "object": "model",
+            "created": 1700000000,
+            "owned_by": "mistral"
+        }
+    ]
+}).encode()
+
+# Ollama API endpoint for listing models
+TAGS_BODY = json.dumps({
+    "models": [
+        {
+            "name": "qwen2.5-coder:32b",
+            "modified_at": "2024-01-01T00:00:00Z",
+            "size": 19000000000,
+            "digest": "sha256:abcdef123456",
+            "details": {
+                "format": "gguf",
+                "family": "qwen",
+                "parameter_size": "32B",
+                "quantization_level": "Q4_0"
             }
-            self.wfile.write(json.dumps(response).encode())
-        elif self.path == '/api/tags':
-            # Ollama API endpoint for listing models
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
+        }
+    ]
+}).encode()
+
+# Ollama version endpoint
+VERSION_BODY = json.dumps({"version": "0.1.0"}).encode()
+
+CHAT_BODY = json.dumps({
+    "id": "chatcmpl-123",
+    "object": "chat.completion",
+    "created": 1700000000,
+    "model": "qwen2.5-coder:32b",
+    "choices": [{
+        "index": 0,
+        "message": {
+            "role": "assistant",
+            "content": "Hello! This is a mock response."
+        },
+        "finish_reason": "stop"
+    }],
+    "usage": {
+        "prompt_tokens": 10,
+        "completion_tokens": 20,
+        "total_tokens": 30
+    }
+}).encode()
+
+# Ollama pull endpoint (mock)
+PULL_BODY = json.dumps({
+    "status": "success",
+    "digest": "sha256:abcdef123456",
+    "total": 1000000,
+    "completed": 1000000
+}).encode()
+
+# Ollama embeddings endpoint, mock 768-dimensional embedding
+EMBED_BODY = json.dumps({"embedding": [0.1] * 768}).encode()
+
+TOO_LARGE_BODY = json.dumps(
+    {"error": f"Request too large. Maximum size is {MAX_REQUEST_SIZE} bytes"}
+).encode()
+INVALID_JSON_BODY = json.dumps({"error": "Invalid JSON in request body"}).encode()
+INVALID_LENGTH_BODY = json.dumps({"error": "Invalid Content-Length header"}).encode()
+TOO_MANY_HEADERS_BODY = json.dumps({"error": "Too many headers"}).encode()
+
+class MockMistralHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests so test suites making many
+    # calls don't pay a TCP handshake each time
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+
+    def setup(self):
+        super().setup()
+        # Responses go out in a single write, so Nagle would only add latency
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._idle = False
+
+    def _wait_for_request(self):
+        """Wait for the next request on a kept-alive connection
+
+        Returns False if the worker should be handed to a queued connection
+        or the client stayed idle past the timeout.
+        """
+        connection = self.connection
+        deadline = time.monotonic() + self.timeout
+        while True:
+            # A pipelined request may already sit in the read buffer, where
+            # select() can't see it; peek without blocking to find out
+            connection.settimeout(0)
+            try:
+                if self.rfile.peek(1):
+                    return True
+            finally:
+                connection.settimeout(self.timeout)
+            readable, _, _ = select.select([connection], [], [], IDLE_POLL_INTERVAL)
+            if readable:
+                return True
+            if self.server.queued_connections:
+                return False
+            if time.monotonic() >= deadline:
+                self.log_error("Idle keep-alive connection timed out")
+                return False
+
+    def handle_one_request(self):
+        # Between requests, don't park the worker while others wait for one
+        if self._idle and not self._wait_for_request():
+            self.close_connection = True
+            return
+        self._idle = True
+        # Health probes arrive far more often than anything else; answer them
+        # without building the parsed request objects
+        try:
+            prefix = self.rfile.peek(len(HEALTH_REQUEST_PREFIX))
+        except socket.timeout as e:
+            self.log_error("Request timed out: %r", e)
+            self.close_connection = True
+            return
+        if prefix.startswith(HEALTH_REQUEST_PREFIX):
+            self._handle_health_probe()
+        else:
+            super().handle_one_request()
+
+    def _handle_health_probe(self):
+        """Skip past a GET /health request and write the canned reply"""
+        readline = self.rfile.readline
+        try:
+            request_line = readline(65537)
+            self.requestline = request_line.decode('iso-8859-1').rstrip('\r\n')
+            close = not request_line.rstrip().endswith(b'HTTP/1.1')
+            has_body = False
+            for _ in range(MAX_HEADERS + 1):
+                line = readline(65537)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.partition(b':')
+                name = name.strip().lower()
+                if name in (b'content-length', b'transfer-encoding'):
+                    has_body = True
+                elif name == b'connection':
+                    value = value.strip().lower()
+                    if value == b'close':
+                        close = True
+                    elif value == b'keep-alive':
+                        close = False
+            else:
+                # The rest of the headers are still unread
+                self.close_connection = True
+                self._send_bytes(TOO_MANY_HEADERS_BODY, status=431)
+                return
+        except socket.timeout as e:
+            self.log_error("Request timed out: %r", e)
+            self.close_connection = True
+            return
+        # An empty read means the client hung up before finishing headers;
+        # probe bodies are never read, so don't parse one as the next request
+        self.close_connection = close or has_body or not line
+        self.log_request(200, len(HEALTH_BODY))
+        self.wfile.write(HEALTH_RESPONSE if self._keep_alive()
+                         else HEALTH_CLOSE_RESPONSE)
+
+    def _keep_alive(self):
+        """Decide whether this connection may stay open after the response"""
+        if self.server.queued_connections:
+            # A kept-alive socket pins its worker; hand it to a waiting
+            # connection instead of starving it
+            self.close_connection = True
+        return not self.close_connection
+
+    def _response_head(self, status, ctype, length):
+        """Build the status line and headers for a response"""
+        self.log_request(status)
+        head = b'%sContent-Type: %s\r\nContent-Length: %d\r\n' % (
+            self.STATUS_LINES[status], ctype, length)
+        if self._keep_alive():
+            return head + b'Connection: keep-alive\r\n\r\n'
+        return head + b'Connection: close\r\n\r\n'
+
+    def _send_bytes(self, body, ctype=b'application/json', status=200):
+        """Write a complete response with a single write call"""
+        self.wfile.write(self._response_head(status, ctype, len(body)) + body)
+
+    def _read_body(self, length):
+        """Read exactly length bytes of request body into one buffer
+
+        Returns None if the client stalled past the socket timeout.
+        """
+        buf = bytearray(length)
+        view = memoryview(buf)
+        readinto = self.rfile.readinto
+        offset = 0
+        try:
+            while offset < length:
+                count = readinto(view[offset:])
+                if not count:
+                    # Client went away mid-body; the connection is unusable
+                    self.close_connection = True
+                    break
+                offset += count
+        except socket.timeout as e:
+            self.log_error("Request body timed out: %r", e)
+            self.close_connection = True
+            return None
+        finally:
+            view.release()
+        del buf[offset:]
+        return bytes(buf)
+
+    def _discard_body(self, length):
+        """Consume length bytes of request body without keeping them
+
+        Returns False if the client stalled past the socket timeout.
+        """
+        read = self.rfile.read
+        try:
+            while length > 0:
+                chunk = read(min(length, DRAIN_CHUNK_SIZE))
+                if not chunk:
+                    self.close_connection = True
+                    break
+                length -= len(chunk)
+        except socket.timeout as e:
+            self.log_error("Request body timed out: %r", e)
+            self.close_connection = True
+            return False
+        return True
+
+    def _not_found(self, *args):
+        self._send_bytes(b'', status=404)
+
+    def _get_health(self):
+        self._send_bytes(HEALTH_BODY, b'text/plain')
+
+    def _get_models(self):
+        self._send_bytes(MODELS_BODY)
+
+    def _get_tags(self):
+        self._send_bytes(TAGS_BODY)
+
+    def _get_version(self):
+        self._send_bytes(VERSION_BODY)
+
+    def _post_chat(self, post_data):
+        self._send_bytes(CHAT_BODY)
+
+    def _post_generate(self, post_data):
+        # Ollama generate endpoint
+        try:
+            request = _loads(post_data)
+        except json.JSONDecodeError:
+            self._send_bytes(INVALID_JSON_BODY, status=400)
+            return
+
+        model = request.get('model', 'qwen2.5-coder:32b')
+        if request.get('stream', False):
+            # Send streaming response; the chunks are tiny, so encode them
+            # up front and send them together with a known length
+            chunks = [
+                _dumps({
+                    "model": model,
+                    "created_at": CREATED_AT,
+                    "response": f"Chunk {i+1} ",
+                    "done": i == 2
+                }) + b"\n"
+                for i in range(3)
+            ]
+            self._send_bytes(b''.join(chunks))
+        else:
+            # Send complete response
             response = {
-                "models": [
-                    {
-                        "name": "qwen2.5-coder:32b",
-                        "modified_at": "2024-01-01T00:00:00Z",
-                        "size": 19000000000,
-                        "digest": "sha256:abcdef123456",
-                        "details": {
-                            "format": "gguf",
-                            "family": "qwen",
-                            "parameter_size": "32B",
-                            "quantization_level": "Q4_0"
-                        }
-                    }
-                ]
+                "model": model,
+                "created_at": CREATED_AT,
+                "response": "This is a mock Ollama response.",
+                "done": True,
+                "context": [1, 2, 3],
+                "total_duration": 1000000000,
+                "load_duration": 50000000,
+                "prompt_eval_count": 10,
+                "prompt_eval_duration": 100000000,
+                "eval_count": 20,
+                "eval_duration": 850000000
             }
-            self.wfile.write(json.dumps(response).encode())
-        elif self.path == '/api/version':
-            # Ollama version endpoint
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"version": "0.1.0"}
-            self.wfile.write(json.dumps(response).encode())
-        else:
-            self.send_response(404)
-            self.end_headers()
+            self._send_bytes(_dumps(response))
+
+    def _post_pull(self, post_data):
+        self._send_bytes(PULL_BODY)
+
+    def _post_embeddings(self, post_data):
+        try:
+            _loads(post_data)
+        except json.JSONDecodeError:
+            self._send_bytes(INVALID_JSON_BODY, status=400)
+            return
+        self._send_bytes(EMBED_BODY)
+
+    # Route tables: path -> handler function; POST routes also declare
+    # whether the handler looks at the request body
+    GET_ROUTES = {
+        '/health': _get_health,
+        '/v1/models': _get_models,
+        '/api/tags': _get_tags,
+        '/api/version': _get_version,
+    }
+    POST_ROUTES = {
+        '/v1/chat/completions': (_post_chat, False),
+        '/api/generate': (_post_generate, True),
+        '/api/pull': (_post_pull, False),
+        '/api/embeddings': (_post_embeddings, True),
+    }
+
+    def do_GET(self):
+        if 'Content-Length' in self.headers or 'Transfer-Encoding' in self.headers:
+            # GET bodies are never read; don't parse one as the next request
+            self.close_connection = True
+        self.GET_ROUTES.get(self.path, MockMistralHandler._not_found)(self)
             
     def do_POST(self):
-        # Check request size
-        content_length = int(self.headers.get('Content-Length', 0))
+        path = self.path
+        if 'Transfer-Encoding' in self.headers:
+            # Chunked bodies aren't decoded; the connection can't be reused
+            self.close_connection = True
+        # Check request size before reading any of the body; only plain
+        # digits are valid (int() would also take '+5', ' 5' and '1_0')
+        length_header = self.headers.get('Content-Length', '0')
+        if not (length_header.isascii() and length_header.isdigit()):
+            self.close_connection = True
+            self._send_bytes(INVALID_LENGTH_BODY, status=400)
+            return
+        content_length = int(length_header)
         if content_length > MAX_REQUEST_SIZE:
-            self.send_response(413)  # Payload Too Large
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            error = {"error": f"Request too large. Maximum size is {MAX_REQUEST_SIZE} bytes"}
-            self.wfile.write(json.dumps(error).encode())
-            logger.warning(f"Request rejected: size {content_length} exceeds limit")
+            # The unread body would be parsed as the next request
+            self.close_connection = True
+            self._send_bytes(TOO_LARGE_BODY, status=413)  # Payload Too Large
+            logger.warning("Request rejected: size %d exceeds limit", content_length)
             return
             
-        post_data = self.rfile.read(content_length)
-        logger.info(f"Received {self.command} request to {self.path} ({content_length} bytes)")
-        
-        if self.path == '/v1/chat/completions':
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            response = {
-                "id": "chatcmpl-123",
-                "object": "chat.completion",
-                "created": 1700000000,
-                "model": "qwen2.5-coder:32b",
-                "choices": [{
-                    "index": 0,
-                    "message": {
-                        "role": "assistant",
-                        "content": "Hello! This is a mock response."
-                    },
-                    "finish_reason": "stop"
-                }],
-                "usage": {
-                    "prompt_tokens": 10,
-                    "completion_tokens": 20,
-                    "total_tokens": 30
-                }
-            }
-            self.wfile.write(json.dumps(response).encode())
-        elif self.path == '/api/generate':
-            # Ollama generate endpoint
-            try:
-                request = json.loads(post_data)
-                stream = request.get('stream', False)
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                
-                if stream:
-                    # Send streaming response
-                    for i in range(3):
-                        chunk = {
-                            "model": request.get('model', 'qwen2.5-coder:32b'),
-                            "created_at": time.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
-                            "response": f"Chunk {i+1} ",
-                            "done": i == 2
-                        }
-                        self.wfile.write((json.dumps(chunk) + "\n").encode())
-                        self.wfile.flush()
-                else:
-                    # Send complete response
-                    response = {
-                        "model": request.get('model', 'qwen2.5-coder:32b'),
-                        "created_at": time.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
-                        "response": "This is a mock Ollama response.",
-                        "done": True,
-                        "context": [1, 2, 3],
-                        "total_duration": 1000000000,
-                        "load_duration": 50000000,
-                        "prompt_eval_count": 10,
-                        "prompt_eval_duration": 100000000,
-                        "eval_count": 20,
-                        "eval_duration": 850000000
-                    }
-                    self.wfile.write(json.dumps(response).encode())
-            except json.JSONDecodeError:
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                error = {"error": "Invalid JSON in request body"}
-                self.wfile.write(json.dumps(error).encode())
-        elif self.path == '/api/pull':
-            # Ollama pull endpoint (mock)
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {
-                "status": "success",
-                "digest": "sha256:abcdef123456",
-                "total": 1000000,
-                "completed": 1000000
-            }
-            self.wfile.write(json.dumps(response).encode())
-        elif self.path == '/api/embeddings':
-            # Ollama embeddings endpoint
-            try:
-                request = json.loads(post_data)
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                response = {
-                    "embedding": [0.1] * 768  # Mock 768-dimensional embedding
-                }
-                self.wfile.write(json.dumps(response).encode())
-            except json.JSONDecodeError:
-                self.send_response(400)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                error = {"error": "Invalid JSON in request body"}
-                self.wfile.write(json.dumps(error).encode())
+        logger.info("Received %s request to %s (%d bytes)",
+                    self.command, path, content_length)
+
+        handler, needs_body = self.POST_ROUTES.get(
+            path, (MockMistralHandler._not_found, False))
+        if needs_body:
+            post_data = self._read_body(content_length)
+            if post_data is None:
+                return
         else:
-            self.send_response(404)
-            self.end_headers()
+            # Still take the body off the wire, even when closing: closing
+            # with unread data resets the socket under the client's upload
+            post_data = None
+            if not self._discard_body(content_length):
+                return
+        handler(self, post_data)
             
     def log_message(self, format, *args):
         # Use custom logger instead of default
-        logger.debug(format % args)
+        logger.debug(format, *args)
 
-if __name__ == '__main__':
-    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
-    server = HTTPServer(('0.0.0.0', port), MockMistralHandler)
-    print(f"Mock Mistral server running on port {port}")
+# Encoded status lines, so responses don't rebuild them per request
+MockMistralHandler.STATUS_LINES = {
+    status.value: b'%s %d %s\r\n' % (
+        MockMistralHandler.protocol_version.encode(), status.value,
+        status.phrase.encode())
+    for status in HTTPStatus
+}
+
+class MockMistralServer(HTTPServer):
+    """HTTP server dispatching connections to a fixed-size thread pool"""
+
+    # Absorb connection bursts from load tests instead of refusing them;
+    # HTTPServer already sets SO_REUSEADDR for restarts during TIME_WAIT
+    request_queue_size = 1024
+
+    def __init__(self, server_address, handler_class, max_workers=DEFAULT_MAX_WORKERS,
+                 bind_and_activate=True):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers,
+                                       thread_name_prefix='mock-worker')
+        # Connections currently owned by a worker, so shutdown can end them
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        # Accepted connections still waiting for a free worker
+        self.queued_connections = 0
+        super().__init__(server_address, handler_class, bind_and_activate)
+
+    def process_request(self, request, client_address):
+        with self._connections_lock:
+            self.queued_connections += 1
+        self.pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        with self._connections_lock:
+            self.queued_connections -= 1
+            self._connections.add(request)
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._connections_lock:
+                self._connections.discard(request)
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        # Pool workers are joined at interpreter exit; unblock any still
+        # serving a keep-alive client so Ctrl-C actually exits
+        with self._connections_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+def _serve(server):
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def _run_prefork(port, max_workers, processes):
+    """Fork worker processes that all accept on one shared listening socket"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('0.0.0.0', port))
+    sock.listen(MockMistralServer.request_queue_size)
+
+    children = []
+    for _ in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            # Each child runs its own thread pool, created after the fork
+            server = MockMistralServer(('0.0.0.0', port), MockMistralHandler,
+                                       max_workers, bind_and_activate=False)
+            server.socket.close()
+            server.socket = sock
+            _serve(server)
+            os._exit(0)
+        children.append(pid)
+    sock.close()
+
+    # Take the children down with us when stopped via SIGTERM as well
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except (KeyboardInterrupt, SystemExit):
+        print("\nShutting down mock server")
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+def run(port, max_workers=DEFAULT_MAX_WORKERS, processes=1):
+    """Serve the mock API on the given port until interrupted"""
+    print(f"Mock Mistral server running on port {port} "
+          f"({processes} processes x {max_workers} workers)", flush=True)
+    if processes > 1:
+        _run_prefork(port, max_workers, processes)
+        return
+
+    server = MockMistralServer(('0.0.0.0', port), MockMistralHandler, max_workers)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down mock server")
-        server.shutdown()
\ No newline at end of file
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_MAX_WORKERS
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    run(port, max_workers, processes)